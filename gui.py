@@ -1,20 +1,60 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
+import atexit
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from random import choice
 from collections import Counter
-import threading
-import webbrowser
-from tkinter import font as tkfont
 
-from src.solver import solve_packing
-from src.utils import resource_path
-from src.visualizer import ResultVisualizer
+from src.utils import load_shapes_file, resource_path
+from src.visualizer import PERSISTENT_TAG, ResultVisualizer
 
 GRID_WIDTH = 9
 GRID_HEIGHT = 9
 
+
+def _cell_bit(r, c):
+    """Returns the bit of cell (r, c) in the container grid bitmask."""
+    return 1 << (r * GRID_WIDTH + c)
+
+
+def _mask_to_cells(mask):
+    """Expands a container grid bitmask into a row-major list of (r, c) cells."""
+    cells = []
+    while mask:
+        low_bit = mask & -mask
+        cells.append(divmod(low_bit.bit_length() - 1, GRID_WIDTH))
+        mask ^= low_bit
+    return cells
+
+
+def _preload_solver():
+    """Initializer of the solver process: imports OR-Tools before the first Calculate click."""
+    import src.solver  # noqa: F401
+
+
+def _solve_worker(shape_counts, shape_defs, grid_mask, must_place_names, time_limit):
+    """Entry point executed in the solver process."""
+    # 在子进程中才导入求解器，GUI 进程不必承担 OR-Tools 的导入开销
+    from src.solver import solve_packing
+
+    return solve_packing(
+        shape_counts,
+        shape_defs,
+        _mask_to_cells(grid_mask),
+        board_size=(GRID_WIDTH, GRID_HEIGHT),
+        must_place_names=must_place_names,
+        time_limit_sec=time_limit,
+    )
+
+
+# 容器网格的全开状态，以及默认可用区域：第 2-6 行、第 3-5 列
+_FULL_GRID_MASK = (1 << (GRID_WIDTH * GRID_HEIGHT)) - 1
+_DEFAULT_GRID_MASK = sum(_cell_bit(r, c) for r in range(2, 7) for c in range(3, 6))
+
 class ScrollableFrame(ttk.Frame):
     """自定义的可滚动 Frame，支持鼠标滚轮和自适应宽度"""
     def __init__(self, container, *args, **kwargs):
@@ -68,6 +108,10 @@ class ShapePackingGUI(tk.Tk):
         self.title("Shape Packing Calculator")
         self.geometry("1000x850")  # Increased height for the new grid
 
+        # 求解在独立进程中进行，避免与 Tk 事件循环争抢解释器
+        self._solver_pool = self._create_solver_pool()
+        atexit.register(self._shutdown_solver_pool)
+
         self.always_on_top = tk.BooleanVar()
         self.always_on_top.set(False)
 
@@ -76,6 +120,9 @@ class ShapePackingGUI(tk.Tk):
 
         self.time_limit_var = tk.StringVar(value="30")
 
+        # 总面积刷新的待执行回调 id，用于合并短时间内的多次刷新请求
+        self._total_area_pending = None
+
         # Main container
         main_frame = ttk.Frame(self)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -96,26 +143,34 @@ class ShapePackingGUI(tk.Tk):
         container_frame = ttk.LabelFrame(left_frame, text="Container Shape (9x9)")
         container_frame.pack(pady=5, padx=5, fill=tk.X)
 
-        self.container_grid_cells = []
-        self.container_grid_status = [[0] * 9 for _ in range(9)]
-        cell_size = 22
+        # 整个 9x9 网格画在同一个 Canvas 上，每个格子是一个矩形 item，点击时按像素坐标换算行列
+        # 格子状态压缩为一个 81 位整数，第 r * 9 + c 位为 1 表示该格子可用
+        self._grid_mask = 0
+        self._container_cell_size = 24
+        cell_size = self._container_cell_size
+        self.container_canvas = tk.Canvas(
+            container_frame,
+            width=9 * cell_size + 1,
+            height=9 * cell_size + 1,
+            highlightthickness=0,
+        )
+        self.container_canvas.grid(row=0, column=0, columnspan=9)
+        self._cell_items = []
         for r in range(9):
-            row_cells = []
+            row_items = []
             for c in range(9):
-                canvas = tk.Canvas(
-                    container_frame,
-                    width=cell_size,
-                    height=cell_size,
-                    bg="white",
-                    highlightthickness=1,
-                    highlightbackground="gray",
+                item = self.container_canvas.create_rectangle(
+                    c * cell_size,
+                    r * cell_size,
+                    (c + 1) * cell_size,
+                    (r + 1) * cell_size,
+                    fill="white",
+                    outline="gray",
+                    tags=self._container_cell_tags(r, c),
                 )
-                canvas.grid(row=r, column=c)
-                canvas.bind(
-                    "<Button-1>", lambda e, r=r, c=c: self.toggle_container_cell(r, c)
-                )
-                row_cells.append(canvas)
-            self.container_grid_cells.append(row_cells)
+                row_items.append(item)
+            self._cell_items.append(row_items)
+        self.container_canvas.bind("<Button-1>", self._on_container_click)
 
         # --- Board Area Display ---
         self.board_area_var = tk.StringVar(value="棋盘总面积: 0")
@@ -174,6 +229,10 @@ class ShapePackingGUI(tk.Tk):
         self.result_canvas = tk.Canvas(right_frame, bg="white")
         self.result_canvas.pack(fill=tk.BOTH, expand=True)
         self.visualizer = ResultVisualizer(self.result_canvas, on_clear_unplaced=self.clear_unplaced_shapes)
+        # 常驻的 "Calculating..." 提示，计算时显示、出结果前隐藏，不随每次计算重建
+        self._calc_text_id = self.result_canvas.create_text(
+            0, 0, text="Calculating...", font=("Arial", 16), state="hidden", tags=(PERSISTENT_TAG,)
+        )
 
         self.current_result = None
         self.current_unplaced_shapes = []
@@ -257,16 +316,14 @@ class ShapePackingGUI(tk.Tk):
         # Update entries based on JSON data
         unmatched_keys = []
         for name, count in data.items():
-            if name in self.shape_entries:
+            if name in self.shape_vars:
                 try:
                     # Ensure count is a non-negative integer
                     value = int(count)
                     if value < 0:
                         value = 0
 
-                    entry = self.shape_entries[name]
-                    entry.delete(0, tk.END)
-                    entry.insert(0, str(value))
+                    self.shape_vars[name].set(str(value))
                 except (ValueError, TypeError):
                     # If count is not a valid number, keep it as 0
                     continue
@@ -274,7 +331,7 @@ class ShapePackingGUI(tk.Tk):
                 unmatched_keys.append(name)
 
         # Update total area
-        self._update_total_area()
+        self._schedule_total_area()
 
         if unmatched_keys:
             messagebox.showwarning(
@@ -307,10 +364,10 @@ class ShapePackingGUI(tk.Tk):
         # 1. Save existing counts and lock states if they exist
         old_counts = {}
         old_locks = {}
-        if hasattr(self, "shape_entries"):
-            for name, entry in self.shape_entries.items():
+        if hasattr(self, "shape_vars"):
+            for name, var in self.shape_vars.items():
                 try:
-                    old_counts[name] = entry.get()
+                    old_counts[name] = var.get()
                 except Exception:
                     pass
         if hasattr(self, "shape_lock_vars"):
@@ -324,26 +381,31 @@ class ShapePackingGUI(tk.Tk):
         if hasattr(self, "shapes_grid_container") and self.shapes_grid_container:
             self.shapes_grid_container.destroy()
 
-        shape_file_path = resource_path("shapes.json")
-        with open(shape_file_path, "r") as f:
-            self.shapes_data = json.load(f)
+        self.shapes_data = load_shapes_file(resource_path("shapes.json"))
+        # 形状定义可能已变化，之前缓存的求解结果失效
+        self._last_optimal_solve = None
+        # 预先建立按名称索引的形状表和面积表，避免每次按键/计算时重复构建
+        self._shapes_by_name = {s["name"]: s for s in self.shapes_data}
+        self._shape_area = {s["name"]: s["area"] for s in self.shapes_data}
 
         # Create a container frame for the grid
         self.shapes_grid_container = ttk.Frame(parent_frame)
         self.shapes_grid_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        self.shape_entries = {}
+        self.shape_vars = {}
         self.shape_lock_vars = {}
         self.shape_lock_labels = {}
 
         num_columns = 2
+        for col in range(num_columns):
+            self.shapes_grid_container.grid_columnconfigure(col, weight=1)
+
         for i, shape_data in enumerate(self.shapes_data):
             row = i // num_columns
             col = i % num_columns
 
             shape_frame = ttk.Frame(self.shapes_grid_container)
             shape_frame.grid(row=row, column=col, padx=2, pady=1, sticky="nsew")
-            self.shapes_grid_container.grid_columnconfigure(col, weight=1)
 
             # Lock button
             lock_var = tk.BooleanVar()
@@ -375,17 +437,18 @@ class ShapePackingGUI(tk.Tk):
             entry_frame = ttk.Frame(shape_frame)
             entry_frame.grid(row=1, column=2, sticky="w")
 
-            entry = ttk.Entry(entry_frame, width=5)
+            var = tk.StringVar(value=old_counts.get(shape_data["name"], "0"))
+            var.trace_add("write", self._on_quantity_write)
+            self.shape_vars[shape_data["name"]] = var
+
+            entry = ttk.Entry(entry_frame, width=5, textvariable=var)
             entry.pack(side=tk.LEFT)
-            entry.insert(0, old_counts.get(shape_data["name"], "0"))
-            self.shape_entries[shape_data["name"]] = entry
-            entry.bind("<KeyRelease>", lambda event: self._update_total_area())
 
             up_button = ttk.Button(
                 entry_frame,
                 text="▲",
                 width=2,
-                command=lambda e=entry: self._increment_value(e),
+                command=lambda v=var: self._increment_value(v),
             )
             up_button.pack(side=tk.LEFT, padx=(2, 0))
 
@@ -393,45 +456,54 @@ class ShapePackingGUI(tk.Tk):
                 entry_frame,
                 text="▼",
                 width=2,
-                command=lambda e=entry: self._decrement_value(e),
+                command=lambda v=var: self._decrement_value(v),
             )
             down_button.pack(side=tk.LEFT, padx=(2, 0))
 
+        # 窗口已显示时（如形状管理后重新加载）立即刷新一次布局；首次构建时交给 mainloop 处理
+        if self.winfo_ismapped():
+            self.update_idletasks()
+
         # Update total area calculation to reflect restored/loaded states
-        self._update_total_area()
+        self._schedule_total_area()
+
+    def _on_quantity_write(self, *_):
+        self._schedule_total_area()
 
-    def _increment_value(self, entry):
+    def _increment_value(self, var):
         try:
-            value = int(entry.get())
-            entry.delete(0, tk.END)
-            entry.insert(0, str(value + 1))
+            value = int(var.get())
+            var.set(str(value + 1))
         except ValueError:
-            entry.delete(0, tk.END)
-            entry.insert(0, "0")
-        self._update_total_area()
+            var.set("0")
 
-    def _decrement_value(self, entry):
+    def _decrement_value(self, var):
         try:
-            value = int(entry.get())
+            value = int(var.get())
             if value > 0:
-                entry.delete(0, tk.END)
-                entry.insert(0, str(value - 1))
+                var.set(str(value - 1))
         except ValueError:
-            entry.delete(0, tk.END)
-            entry.insert(0, "0")
+            var.set("0")
+
+    def _schedule_total_area(self):
+        """Coalesces total-area refreshes into a single deferred update."""
+        if self._total_area_pending is None:
+            self._total_area_pending = self.after(50, self._run_total_area)
+
+    def _run_total_area(self):
+        self._total_area_pending = None
         self._update_total_area()
 
     def _update_total_area(self):
         """Calculates and updates the total area of selected shapes."""
         total_area = 0
-        shapes_by_name = {shape["name"]: shape for shape in self.shapes_data}
+        shape_area = self._shape_area
 
-        for name, entry in self.shape_entries.items():
+        for name, var in self.shape_vars.items():
             try:
-                count = int(entry.get())
-                if count > 0 and name in shapes_by_name:
-                    shape_area = len(shapes_by_name[name]["points"])
-                    total_area += count * shape_area
+                count = int(var.get())
+                if count > 0:
+                    total_area += count * shape_area[name]
             except (ValueError, KeyError):
                 continue  # Ignore invalid entries or shapes not found
 
@@ -440,7 +512,7 @@ class ShapePackingGUI(tk.Tk):
 
     def _update_board_area(self):
         """Calculates and updates the total area of the container board."""
-        board_area = sum(sum(row) for row in self.container_grid_status)
+        board_area = self._grid_mask.bit_count()
         if hasattr(self, "board_area_var"):
             self.board_area_var.set(f"棋盘总面积: {board_area}")
 
@@ -457,43 +529,46 @@ class ShapePackingGUI(tk.Tk):
         else:
             lock_label.config(fg="black")
 
+    def _on_container_click(self, event):
+        """Maps a click on the container canvas to the cell under the cursor."""
+        r = event.y // self._container_cell_size
+        c = event.x // self._container_cell_size
+        if 0 <= r < 9 and 0 <= c < 9:
+            self.toggle_container_cell(r, c)
+
     def toggle_container_cell(self, r, c):
         """Toggles the state of a container grid cell."""
-        if self.container_grid_status[r][c] == 1:
-            self.container_grid_status[r][c] = 0
-            self.container_grid_cells[r][c].config(bg="black")
-        else:
-            self.container_grid_status[r][c] = 1
-            self.container_grid_cells[r][c].config(bg="white")
+        self._grid_mask ^= _cell_bit(r, c)
+        fill = "white" if self._grid_mask & _cell_bit(r, c) else "black"
+        self.container_canvas.itemconfig(self._cell_items[r][c], fill=fill)
         self._update_board_area()
 
+    @staticmethod
+    def _container_cell_tags(r, c):
+        """Canvas tags for a container cell; default-area cells also carry 'default_cell'."""
+        if _DEFAULT_GRID_MASK & _cell_bit(r, c):
+            return (f"cell:{r}:{c}", "cell", "default_cell")
+        return (f"cell:{r}:{c}", "cell")
+
     def unlock_all_cells(self):
         """Unlocks all cells in the container grid."""
-        for r in range(9):
-            for c in range(9):
-                self.container_grid_status[r][c] = 1
-                self.container_grid_cells[r][c].config(bg="white")
+        self._grid_mask = _FULL_GRID_MASK
+        self.container_canvas.itemconfig("cell", fill="white")
         self._update_board_area()
 
     def reset_container_grid(self):
         """Resets the container grid to its default state."""
-        for r in range(9):
-            for c in range(9):
-                # Default: rectangle from (2,3) to (6,5) is available
-                if 2 <= r <= 6 and 3 <= c <= 5:
-                    self.container_grid_status[r][c] = 1
-                    self.container_grid_cells[r][c].config(bg="white")
-                else:
-                    self.container_grid_status[r][c] = 0
-                    self.container_grid_cells[r][c].config(bg="black")
+        # 默认区域在创建时已打上 tag，重置只需两次批量 itemconfig
+        self._grid_mask = _DEFAULT_GRID_MASK
+        self.container_canvas.itemconfig("cell", fill="black")
+        self.container_canvas.itemconfig("default_cell", fill="white")
         self._update_board_area()
 
     def clear_shape_entries(self):
         """Resets all shape entry values to 0."""
-        for entry in self.shape_entries.values():
-            entry.delete(0, tk.END)
-            entry.insert(0, "0")
-        self._update_total_area()
+        for var in self.shape_vars.values():
+            var.set("0")
+        self._schedule_total_area()
 
     def draw_shape(self, canvas, points, color):
         if not points:
@@ -510,66 +585,66 @@ class ShapePackingGUI(tk.Tk):
         offset_x = (40 - (max_x - min_x) * scale) / 2
         offset_y = (40 - (max_y - min_y) * scale) / 2
 
+        # 把形状光栅化到一张 PhotoImage 上，整个预览只占用一个 Canvas item
+        img = tk.PhotoImage(master=canvas, width=40, height=40)
         for x, y in points:
-            x0 = (x - min_x) * scale + offset_x
-            y0 = (y - min_y) * scale + offset_y
-            x1 = x0 + scale
-            y1 = y0 + scale
-            canvas.create_rectangle(x0, y0, x1, y1, fill=color)
+            x0 = round((x - min_x) * scale + offset_x)
+            y0 = round((y - min_y) * scale + offset_y)
+            x1 = min(round((x - min_x + 1) * scale + offset_x), 39)
+            y1 = min(round((y - min_y + 1) * scale + offset_y), 39)
+            # 先铺黑色作为描边，再在内部填充形状颜色
+            img.put("black", to=(x0, y0, x1 + 1, y1 + 1))
+            img.put(color, to=(x0 + 1, y0 + 1, x1, y1))
+
+        canvas.image = img  # 保留引用，防止 PhotoImage 被回收
+        canvas.create_image(0, 0, anchor="nw", image=img)
 
     def start_calculation_thread(self):
-        """Starts the calculation in a separate thread to avoid freezing the GUI."""
+        """Starts the calculation in the solver process to avoid freezing the GUI."""
         self.calculate_button.config(state=tk.DISABLED)
-        self.result_canvas.delete("all")
-        self.result_canvas.create_text(
+        # 只有画布上还留着上一次的结果时才需要清空
+        if self.result_canvas.find_withtag(f"!{PERSISTENT_TAG}"):
+            self.visualizer.clear_canvas()
+        self.result_canvas.coords(
+            self._calc_text_id,
             self.result_canvas.winfo_width() / 2,
             self.result_canvas.winfo_height() / 2,
-            text="Calculating...",
-            font=("Arial", 16),
         )
+        self.result_canvas.itemconfig(self._calc_text_id, state="normal")
 
-        thread = threading.Thread(target=self.calculate_and_update_ui)
-        thread.daemon = True  # Allows main window to close even if thread is running
-        thread.start()
+        self.calculate_and_update_ui()
 
     def calculate_and_update_ui(self):
-        """The core calculation logic, designed to be run in a background thread."""
+        """Collects the solver inputs and submits them to the solver process."""
         try:
             # 1. Collect shape counts from entries
             shape_counts = {}
-            for name, entry in self.shape_entries.items():
+            for name, var in self.shape_vars.items():
                 try:
-                    count = int(entry.get())
+                    count = int(var.get())
                     if count > 0:
                         shape_counts[name] = count
                 except ValueError:
                     continue
 
-            # 2. Prepare the list of shapes to be packed
-            shapes_to_pack = []
-            shapes_by_name = {shape["name"]: shape for shape in self.shapes_data}
-            for name, count in shape_counts.items():
-                if name in shapes_by_name:
-                    for _ in range(count):
-                        shapes_to_pack.append(shapes_by_name[name])
+            # 2. Only the distinct shape definitions are handed to the solver, not one entry per copy
+            shapes_by_name = self._shapes_by_name
+            shape_counts = {name: count for name, count in shape_counts.items() if name in shapes_by_name}
+            shape_defs = {name: shapes_by_name[name] for name in shape_counts}
 
-            if not shapes_to_pack:
-                self.after(0, self.update_ui_with_result, None, [], [])
+            if not shape_counts:
+                self.update_ui_with_result(None, [], [])
                 return
 
             # 3. Collect allowed cells from the container grid
-            allowed_cells = []
-            for r in range(9):
-                for c in range(9):
-                    if self.container_grid_status[r][c] == 1:
-                        allowed_cells.append((r, c))
+            allowed_cells = _mask_to_cells(self._grid_mask)
 
             if not allowed_cells:
-                self.after(0, self.update_ui_with_result, None, [], allowed_cells)
+                self.update_ui_with_result(None, [], allowed_cells)
                 return
 
             # 4. Run the packing algorithm
-            print("Starting layout optimization in background thread...")
+            print("Starting layout optimization in solver process...")
             must_place_names = [
                 name for name, var in self.shape_lock_vars.items() if var.get()
             ]
@@ -579,48 +654,129 @@ class ShapePackingGUI(tk.Tk):
                 if not 10 <= time_limit <= 300:
                     raise ValueError("Time limit must be between 10 and 300.")
             except ValueError:
-                self.after(
-                    0,
-                    lambda: messagebox.showerror(
-                        "Invalid Input",
-                        "Time limit must be a number between 10 and 300.",
-                    ),
+                messagebox.showerror(
+                    "Invalid Input",
+                    "Time limit must be a number between 10 and 300.",
                 )
-                self.after(0, lambda: self.calculate_button.config(state=tk.NORMAL))
+                self._calculation_failed()
                 return
 
-            placed_shapes, unplaced_shape_names, status = solve_packing(
-                shapes_to_pack,
-                allowed_cells,
-                board_size=(GRID_WIDTH, GRID_HEIGHT),
-                must_place_names=must_place_names,
-                time_limit_sec=time_limit,
-            )
-
-            # Reconstruct unplaced_shapes with full data for visualization
-            shapes_by_name = {shape["name"]: shape for shape in self.shapes_data}
-            unplaced_shapes_full = [
-                shapes_by_name[name] for name in unplaced_shape_names if name in shapes_by_name
-            ]
+            # 输入与上一次得到最优解的计算完全相同时，直接复用结果
+            solve_key = (frozenset(shape_counts.items()), self._grid_mask, frozenset(must_place_names), shape_defs)
+            if self._last_optimal_solve is not None and self._last_optimal_solve[0] == solve_key:
+                print("Inputs unchanged since the last optimal solve, reusing its result.")
+                self._show_solver_output(self._last_optimal_solve[1], allowed_cells)
+                return
 
-            # Create a mock result object for compatibility with update_ui_with_result
-            result = {
-                "placed_shapes": placed_shapes,
-                "status": status,
-            }
+            # 网格以位掩码形式传给子进程，保持参数为简单的 int/dict/list，序列化开销最小
+            future = self._solver_pool.submit(
+                _solve_worker,
+                shape_counts,
+                shape_defs,
+                self._grid_mask,
+                must_place_names,
+                time_limit,
+            )
+            future.add_done_callback(lambda f: self._post_solver_result(f, allowed_cells, solve_key))
 
-            print(f"Solver finished with status: {status}")
+        except BrokenProcessPool as e:
+            self._solver_pool_broken(e)
+        except Exception as e:
+            print(f"An error occurred during calculation: {e}")
+            # Ensure the button is re-enabled even if an error occurs
+            self._calculation_failed()
 
-            # 5. Schedule UI update on the main thread
-            self.after(0, self.update_ui_with_result, result, unplaced_shapes_full, allowed_cells)
+    def _post_solver_result(self, future, allowed_cells, solve_key):
+        """Runs in the executor's callback thread and hands the result back to the Tk thread."""
+        try:
+            self.after(0, self._on_solver_done, future, allowed_cells, solve_key)
+        except (RuntimeError, tk.TclError):
+            pass  # 窗口已关闭，丢弃结果
 
+    def _on_solver_done(self, future, allowed_cells, solve_key):
+        """Unpacks the solver result and updates the UI. Must be called from the main thread."""
+        try:
+            solver_output = future.result()
+        except BrokenProcessPool as e:
+            self._solver_pool_broken(e)
+            return
         except Exception as e:
             print(f"An error occurred during calculation: {e}")
-            # Ensure the button is re-enabled even if an error occurs
-            self.after(0, lambda: self.calculate_button.config(state=tk.NORMAL))
+            self._calculation_failed()
+            return
+
+        if solver_output[2] == "OPTIMAL":
+            self._last_optimal_solve = (solve_key, solver_output)
+        self._show_solver_output(solver_output, allowed_cells)
+
+    def _show_solver_output(self, solver_output, allowed_cells):
+        """Converts the (placed, unplaced_names, status) tuple from solve_packing into UI state."""
+        placed_shapes, unplaced_shape_names, status = solver_output
+
+        # Reconstruct unplaced_shapes with full data for visualization
+        shapes_by_name = self._shapes_by_name
+        unplaced_shapes_full = [
+            shapes_by_name[name] for name in unplaced_shape_names if name in shapes_by_name
+        ]
+
+        # Create a mock result object for compatibility with update_ui_with_result
+        result = {
+            "placed_shapes": placed_shapes,
+            "status": status,
+        }
+
+        print(f"Solver finished with status: {status}")
+
+        self.update_ui_with_result(result, unplaced_shapes_full, allowed_cells)
+
+    def _create_solver_pool(self):
+        """Creates the single-worker solver process pool."""
+        # 工作进程启动时即预先导入求解器，首次点击 Calculate 无需等待 OR-Tools 导入；
+        # 统一使用 spawn 启动，工作进程不会继承已初始化的 Tk/X 状态，与 Windows 打包版行为一致
+        pool = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_preload_solver,
+        )
+        # 窗口空闲时提交一个空任务，促使工作进程在用户输入期间就完成启动
+        self.after_idle(pool.submit, int)
+        return pool
+
+    def _shutdown_solver_pool(self):
+        """Shuts down the solver pool without waiting for a running solve."""
+        # 终止仍在运行的求解进程，避免关闭窗口后还要等待求解结束。
+        # ProcessPoolExecutor 没有公开终止工作进程的接口，_processes 是 CPython 的内部属性，
+        # 这里用 getattr 防御：属性不存在时只做常规 shutdown。
+        processes = list((getattr(self._solver_pool, "_processes", None) or {}).values())
+        self._solver_pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def _solver_pool_broken(self, error):
+        """Replaces a broken solver pool and tells the user the calculation failed."""
+        # 工作进程意外退出（崩溃、内存不足、被结束）后进程池不可再用，换一个新的
+        print(f"Solver process terminated unexpectedly: {error}")
+        self._shutdown_solver_pool()
+        self._solver_pool = self._create_solver_pool()
+        self._calculation_failed()
+        messagebox.showerror(
+            "计算失败",
+            "求解进程意外退出，已重新启动求解进程，请重新计算。",
+        )
+
+    def destroy(self):
+        """Stops the solver process before tearing down the window."""
+        self._shutdown_solver_pool()
+        super().destroy()
+
+    def _calculation_failed(self):
+        """Restores the idle UI state after a calculation could not complete."""
+        self.result_canvas.itemconfig(self._calc_text_id, state="hidden")
+        self.calculate_button.config(state=tk.NORMAL)
 
     def update_ui_with_result(self, result, unplaced_shapes, allowed_cells):
         """Updates the UI with the calculation result. Must be called from the main thread."""
+        self.result_canvas.itemconfig(self._calc_text_id, state="hidden")
         self.calculate_button.config(state=tk.NORMAL)
 
         self.current_result = result
@@ -669,18 +825,17 @@ class ShapePackingGUI(tk.Tk):
 
         # 扣除左侧输入数量
         for name, count in unplaced_counts.items():
-            if name in self.shape_entries:
-                entry = self.shape_entries[name]
+            if name in self.shape_vars:
+                var = self.shape_vars[name]
                 try:
-                    val = int(entry.get())
+                    val = int(var.get())
                     new_val = max(0, val - count)
-                    entry.delete(0, tk.END)
-                    entry.insert(0, str(new_val))
+                    var.set(str(new_val))
                 except ValueError:
                     pass
 
         # 更新总面积
-        self._update_total_area()
+        self._schedule_total_area()
 
         # 清空当前未放置形状列表并重新绘制 UI
         self.current_unplaced_shapes = []
@@ -932,5 +1087,6 @@ class ShapePackingGUI(tk.Tk):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # 打包后的可执行文件启动子进程时需要
     app = ShapePackingGUI()
     app.mainloop()
@@ -1,10 +1,12 @@
+from __future__ import annotations
+
 import argparse
-import json
-from typing import Any, Dict, List, Tuple, cast
+import itertools
+from typing import Any, Dict, List
 
 from src.data_models import Shape
 from src.solver import PackingSolver
-from src.utils import resource_path
+from src.utils import load_shapes_file, resource_path
 # Note: The visualizer is not yet implemented, so we will add it later.
 # from src.visualizer import print_board
 
@@ -33,8 +35,7 @@ def main() -> None:
     args = parser.parse_args()
 
     # --- Load Shapes ---
-    with open(resource_path(args.shapes_file)) as f:
-        shapes_list: List[Dict[str, Any]] = json.load(f)
+    shapes_list: List[Dict[str, Any]] = load_shapes_file(resource_path(args.shapes_file))
     shapes_data: Dict[str, Dict[str, Any]] = {
         shape["name"]: shape for shape in shapes_list
     }
@@ -65,9 +66,9 @@ def main() -> None:
                 shapes_to_pack.append(
                     Shape(
                         name=f"{name}_{i+1}",
-                        points=cast(List[Tuple[int, int]], points),
-                        area=cast(int, area),
-                        color=cast(str, color),
+                        points=points,
+                        area=area,
+                        color=color,
                     )
                 )
         else:
@@ -88,7 +89,7 @@ def main() -> None:
 
     print(f"Attempting to pack {len(shapes_to_pack)} shapes on a {board_size[0]}x{board_size[1]} board...")
 
-    allowed_cells = [(row, col) for row in range(height) for col in range(width)]
+    allowed_cells = list(itertools.product(range(height), range(width)))
     solver = PackingSolver(shapes_to_pack, board_size, allowed_cells=allowed_cells)
     result = solver.solve()
 
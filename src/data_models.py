@@ -10,6 +10,15 @@ class Shape:
     points: List[Tuple[int, int]]
     area: int
     color: str
+    # 以下字段在构造时由 points 预先计算：形状外接矩形的尺寸
+    width: int = field(init=False, repr=False, compare=False)
+    height: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        xs = [p[0] for p in self.points]
+        ys = [p[1] for p in self.points]
+        self.width = max(xs) - min(xs) + 1 if xs else 0
+        self.height = max(ys) - min(ys) + 1 if ys else 0
 
 
 @dataclass
@@ -1,23 +1,46 @@
-from typing import List, Tuple
-from .data_models import Shape, Rectangle
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba 是可选依赖，未安装时使用纯 Python 的点集实现
+    njit = None
 
 
 def decompose_shape_to_rectangles(points):
     """
     将一个由点集定义的形状分解为不重叠的矩形列表。
     使用基于扫描线和合并的贪心算法。
+    相同点集的结果会被缓存，重复求解时无需再次分解。
     返回 [(dx, dy, width, height), ...]
     """
     if not points:
         return []
 
-    point_set = {tuple(p) for p in points}
+    return list(_decompose(tuple(tuple(p) for p in points)))
+
+
+@lru_cache(maxsize=512)
+def _decompose(points):
+    if njit is None:
+        return tuple(_decompose_point_set(points))
+
+    mask, min_x, min_y = _points_to_mask(points)
+    return tuple(
+        (x + min_x, y + min_y, w, h)
+        for x, y, w, h in _decompose_mask(mask).tolist()
+    )
+
+
+def _decompose_point_set(points):
+    """纯 Python 实现：直接在点集上扫描，小形状上比逐元素访问 NumPy 数组更快。"""
+    point_set = set(points)
     rectangles = []
 
     while point_set:
         # 找到 y 最小、然后 x 最小的点作为起始点
-        start_point = min(point_set, key=lambda p: (p[1], p[0]))
-        x, y = start_point
+        x, y = min(point_set, key=lambda p: (p[1], p[0]))
 
         # 1. 向右延伸找到最大宽度
         width = 1
@@ -33,20 +56,70 @@ def decompose_shape_to_rectangles(points):
                 if (x + i, y + height) not in point_set:
                     next_row_solid = False
                     break
-            if next_row_solid:
-                height += 1
-            else:
+            if not next_row_solid:
                 break
+            height += 1
 
-        # 将生成的矩形添加到列表
+        # 将生成的矩形添加到列表，并从点集中移除构成该矩形的所有点
         rectangles.append((x, y, width, height))
-
-        # 从点集中移除构成该矩形的所有点
-        points_to_remove = set()
         for i in range(width):
             for j in range(height):
-                points_to_remove.add((x + i, y + j))
-
-        point_set -= points_to_remove
+                point_set.discard((x + i, y + j))
 
     return rectangles
+
+
+def _points_to_mask(points):
+    """将点集平移到原点并转换为布尔掩码，返回 (mask, min_x, min_y)。"""
+    coords = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+    min_x, min_y = coords.min(axis=0)
+    xs = coords[:, 0] - min_x
+    ys = coords[:, 1] - min_y
+
+    mask = np.zeros((int(ys.max()) + 1, int(xs.max()) + 1), dtype=np.bool_)
+    mask[ys, xs] = True
+    return mask, int(min_x), int(min_y)
+
+
+def _scan_mask(mask):
+    """
+    在布尔掩码上做扫描线分解，返回 N x 4 的 int32 数组，每行为 (x, y, width, height)。
+    只使用 numba 支持的写法，仅在安装了 numba 时经 JIT 编译后使用。
+    """
+    height, width = mask.shape
+    mask = mask.copy()
+    rectangles = np.empty((mask.sum(), 4), dtype=np.int32)
+    n = 0
+
+    # 按行优先顺序扫描，遇到的第一个未覆盖格子即为新矩形的左上角
+    for idx in range(height * width):
+        y = idx // width
+        x = idx % width
+        if not mask[y, x]:
+            continue
+
+        # 1. 向右延伸找到最大宽度
+        rect_w = 1
+        while x + rect_w < width and mask[y, x + rect_w]:
+            rect_w += 1
+
+        # 2. 将此线段向下延伸找到最大高度
+        rect_h = 1
+        while y + rect_h < height and mask[y + rect_h, x:x + rect_w].all():
+            rect_h += 1
+
+        # 记录矩形，并从掩码中移除构成该矩形的所有点
+        mask[y:y + rect_h, x:x + rect_w] = False
+        rectangles[n, 0] = x
+        rectangles[n, 1] = y
+        rectangles[n, 2] = rect_w
+        rectangles[n, 3] = rect_h
+        n += 1
+
+    return rectangles[:n]
+
+
+if njit is not None:
+    _decompose_mask = njit(cache=True)(_scan_mask)
+    # 导入时预热一次，把编译开销放在启动阶段，而不是第一次求解时
+    _decompose_mask(np.ones((1, 1), dtype=np.bool_))
@@ -0,0 +1,27 @@
+from typing import List, Optional, Sequence
+
+
+def greedy_bottom_left(
+    candidates: Sequence[Sequence[int]],
+    priorities: Sequence[int],
+) -> List[Optional[int]]:
+    """
+    基于位掩码的贪心放置（Bottom-Left 规则），用于快速构造一个可行解。
+
+    candidates[i] 为第 i 个形状所有合法放置的位掩码，需按放置原点（行优先）的扫描顺序排列；
+    形状按 priorities 从大到小依次放置（相同优先级保持原有顺序），
+    每个形状取第一个与已占用格子不冲突的候选位置。
+    返回每个形状选中的候选下标，未能放下的为 None。
+    """
+    order = sorted(range(len(candidates)), key=lambda i: -priorities[i])
+    chosen: List[Optional[int]] = [None] * len(candidates)
+    occupied = 0
+
+    for i in order:
+        for k, placed_mask in enumerate(candidates[i]):
+            if not placed_mask & occupied:
+                occupied |= placed_mask
+                chosen[i] = k
+                break
+
+    return chosen
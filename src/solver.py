@@ -1,11 +1,12 @@
 import os
-from collections import defaultdict
+from collections import Counter, defaultdict
 from ortools.sat.python import cp_model
 from ortools.sat.python.cp_model import CpSolverSolutionCallback
 from typing import Dict, List, Optional, Tuple
 
 from .data_models import Shape, PlacedShape, PackingResult, PackingStatus
 from .decomposition import decompose_shape_to_rectangles
+from .heuristic import greedy_bottom_left
 
 Point = Tuple[int, int]
 
@@ -38,6 +39,22 @@ def rotate_points(points: List[Point], rotation: int) -> List[Point]:
     return normalize_points(rotated)
 
 
+def points_to_mask(points: List[Point], board_width: int) -> int:
+    """将以 (x, y) 表示的点集编码为位掩码，第 y * board_width + x 位对应一个格子。"""
+    mask = 0
+    for x, y in points:
+        mask |= 1 << (y * board_width + x)
+    return mask
+
+
+def cells_to_mask(cells: List[Tuple[int, int]], board_width: int) -> int:
+    """将以 (row, col) 表示的格子列表编码为与 points_to_mask 相同布局的位掩码。"""
+    mask = 0
+    for r, c in cells:
+        mask |= 1 << (r * board_width + c)
+    return mask
+
+
 def generate_unique_orientations(points: List[Point]) -> List[Dict]:
     """Return unique 0/90/180/270-degree orientations for a shape."""
     orientations = []
@@ -76,21 +93,24 @@ class SolutionCallback(CpSolverSolutionCallback):
         self._board_area = board_area
         self._total_shapes_count = total_shapes_count
         self._strategy = strategy
+        self._used_vars = [s["is_used"] for s in shape_vars]
         self.solution = None
         self._best_objective_value = -1  # 用于记录找到的最佳目标值
 
     def on_solution_callback(self):
         """在每次找到可行解时被调用。"""
-        placed_shapes_count = sum(self.Value(s["is_used"]) for s in self._shape_vars)
-        current_area = sum(s["area"] * self.Value(s["is_used"]) for s in self._shape_vars)
+        # 目标函数即已放置形状的总面积，直接读取即可
+        current_area = int(self.ObjectiveValue())
 
         # 仅当当前解更优时，才保存它
         if current_area > self._best_objective_value:
             self._best_objective_value = current_area
             print(f"找到更优解: 面积 = {current_area}。已保存。")
+            # 每个形状的 is_used 只取值一次，放置与未放置列表共用
+            used = [self.Value(v) for v in self._used_vars]
             placed_shapes = []
-            for s in self._shape_vars:
-                if not self.Value(s["is_used"]):
+            for s, is_used in zip(self._shape_vars, used):
+                if not is_used:
                     continue
 
                 selected_orientation = None
@@ -116,12 +136,13 @@ class SolutionCallback(CpSolverSolutionCallback):
             self.solution = {
                 "placed_shapes": placed_shapes,
                 "unplaced_shapes": [
-                    s["original_shape"].name for s in self._shape_vars if not self.Value(s["is_used"])
+                    s["original_shape"].name for s, is_used in zip(self._shape_vars, used) if not is_used
                 ],
             }
 
         # 检查是否达成了“完美解”并提前停止
         if self._strategy == "P0":  # 策略：装下所有形状
+            placed_shapes_count = sum(self.Value(v) for v in self._used_vars)
             if placed_shapes_count == self._total_shapes_count:
                 print("完美解达成 (P0): 所有形状已装入。停止搜索。")
                 self.StopSearch()
@@ -150,16 +171,51 @@ class PackingSolver:
         self.allowed_cells = allowed_cells
         self.must_place_names = must_place_names if must_place_names is not None else []
         self.time_limit_sec = time_limit_sec
+        # 允许区域的位掩码，放置筛选、面积统计和空判断都基于它
+        self._board_mask = cells_to_mask(self.allowed_cells or [], self.board_width)
 
         self.model = cp_model.CpModel()
         self.shape_vars: List[Dict] = []
         self.orientation_cache: Dict[Tuple[Point, ...], List[Dict]] = {}
+        self.shape_orientations: List[List[Dict]] = []
+        # 面积超过允许区域或没有任何合法放置的形状，不进入模型，直接计入未放置
+        self.pruned_shape_names: List[str] = []
+        # 模型只构建一次，之后的 solve() 只更换解提示与假设
+        self._variables_created = False
+        self._model_built = False
+        self._cp_solver: Optional[cp_model.CpSolver] = None
+
+    def build_model(self):
+        """
+        构建 CP-SAT 模型（变量、约束与目标），重复调用时直接复用已构建的模型。
+        必须放置的形状不写入模型，而是在 solve() 期间临时固定对应的 is_used。
+        """
+        if self._model_built:
+            return
+
+        self._ensure_variables()
+        self._add_constraints()
+        self._set_objective()
+        self._model_built = True
+
+    def _ensure_variables(self):
+        """预处理朝向并创建变量，只在第一次调用时执行。"""
+        if self._variables_created:
+            return
+
+        self._prepare_data()
+        self._create_variables()
+        self._variables_created = True
 
-    def solve(self) -> PackingResult:
+    def solve(self, must_place_names: Optional[List[str]] = None) -> PackingResult:
         """
         执行主要的求解逻辑并返回一个 PackingResult 对象。
+        传入 must_place_names 时覆盖构造时给出的必须放置形状；同一个实例可以反复求解。
         """
-        if not self.allowed_cells:
+        if must_place_names is not None:
+            self.must_place_names = must_place_names
+
+        if not self._board_mask:
             return PackingResult(
                 placed_shapes=[],
                 unplaced_shapes=[s.name for s in self.shapes_to_pack],
@@ -167,80 +223,167 @@ class PackingSolver:
                 status=PackingStatus.INFEASIBLE,
             )
 
-        self._prepare_data()
-        self._create_variables()
-        self._add_constraints()
-        self._set_objective()
+        self._ensure_variables()
+
+        # 必须放置的形状已被剪除（根本放不进允许区域）时，问题无解
+        if any(name in self.must_place_names for name in self.pruned_shape_names):
+            print("必须放置的形状无法放入允许区域，问题无解。")
+            return PackingResult(
+                placed_shapes=[],
+                unplaced_shapes=[s.name for s in self.shapes_to_pack],
+                board_size=(self.board_width, self.board_height),
+                status=PackingStatus.INFEASIBLE,
+            )
+
+        # --- 贪心预放置：全部装下即为最优解，否则作为 CP-SAT 的初始解提示 ---
+        greedy_placements = self._greedy_placements()
+        if all(p is not None for p in greedy_placements):
+            print("贪心放置已装入全部形状，跳过 CP-SAT 求解。")
+            return self._greedy_result(greedy_placements)
+
+        self.build_model()
+        self.model.ClearHints()
+        self._add_hints(greedy_placements)
 
         # --- 步骤 5: 预处理和策略选择 ---
-        total_shape_area = sum(s.area for s in self.shapes_to_pack)
-        board_area = len(self.allowed_cells)
+        total_shape_area = sum(s["area"] for s in self.shape_vars)
+        board_area = self._board_mask.bit_count()
         strategy = "P0" if total_shape_area <= board_area else "P1"
         print(f"预处理: 形状总面积={total_shape_area}, 棋盘面积={board_area}. 采用策略: {strategy}")
 
-        solver = cp_model.CpSolver()
+        solver = self._get_cp_solver()
         solver.parameters.max_time_in_seconds = self.time_limit_sec
 
-        num_cores = os.cpu_count() or 1
-        num_workers = max(1, num_cores // 2)
-        solver.parameters.num_search_workers = num_workers
-        print(f"求解器将使用 {num_workers} (共 {num_cores} 个逻辑核心)。")
-
         # --- 步骤 6 & 7: 实例化回调并求解 ---
         solution_callback = SolutionCallback(
-            self.shape_vars, board_area, len(self.shapes_to_pack), strategy
+            self.shape_vars, board_area, len(self.shape_vars), strategy
         )
-        status = solver.Solve(self.model, solution_callback)
+        # 必须放置的形状在求解期间把 is_used 的定义域收紧为 {1}，求解后恢复，
+        # 换一组必须放置的形状无需重建模型。不使用假设（assumptions），
+        # 因为 CP-SAT 在有假设时会退化为单线程搜索。
+        locked = [s["is_used"] for s in self.shape_vars if s["name"] in self.must_place_names]
+        self._set_lower_bounds(locked, 1)
+        try:
+            status = solver.Solve(self.model, solution_callback)
+        finally:
+            self._set_lower_bounds(locked, 0)
 
         return self._process_solution(solver, status, solution_callback)
 
+    def _set_lower_bounds(self, bool_vars: List, lower_bound: int):
+        """直接修改模型中布尔变量定义域的下界（0 为 {0, 1}，1 为 {1}）。"""
+        variables = self.model.Proto().variables
+        for var in bool_vars:
+            variables[var.Index()].domain[0] = lower_bound
+
+    def _get_cp_solver(self) -> cp_model.CpSolver:
+        """返回配置好参数的 CpSolver，多次求解共用同一个实例。"""
+        if self._cp_solver is not None:
+            return self._cp_solver
+
+        solver = cp_model.CpSolver()
+        # 加强 NoOverlap2D 的传播：时间表推理、能量推理与面积能量推理
+        solver.parameters.use_timetabling_in_no_overlap_2d = True
+        solver.parameters.use_energetic_reasoning_in_no_overlap_2d = True
+        solver.parameters.use_area_energetic_reasoning_in_no_overlap_2d = True
+
+        num_cores = os.cpu_count() or 1
+        # CP-SAT 的并行组合在 8 个左右的工作线程时收益最好，再多提升有限
+        num_workers = min(num_cores, 8)
+        solver.parameters.num_search_workers = num_workers
+        print(f"求解器将使用 {num_workers} (共 {num_cores} 个逻辑核心)。")
+
+        self._cp_solver = solver
+        return solver
+
     def _prepare_data(self):
         """预处理每个形状的唯一旋转朝向。"""
+        board_short, board_long = sorted((self.board_width, self.board_height))
+        orientations_by_shape: Dict[int, List[Dict]] = {}
         for shape in self.shapes_to_pack:
-            normalized_points = normalize_points([tuple(p) for p in shape.points])
-            cache_key = tuple(normalized_points)
+            if id(shape) in orientations_by_shape:
+                continue
+
+            # 外接矩形在任何旋转下都放不进棋盘时，无需生成朝向。
+            shape_short, shape_long = sorted((shape.width, shape.height))
+            if shape_short > board_short or shape_long > board_long:
+                orientations_by_shape[id(shape)] = []
+                continue
+
+            cache_key = tuple(normalize_points([tuple(p) for p in shape.points]))
             if cache_key not in self.orientation_cache:
-                self.orientation_cache[cache_key] = generate_unique_orientations(normalized_points)
+                self.orientation_cache[cache_key] = generate_unique_orientations(list(cache_key))
+            orientations_by_shape[id(shape)] = self.orientation_cache[cache_key]
 
-    def _get_shape_orientations(self, shape: Shape) -> List[Dict]:
-        normalized_points = normalize_points([tuple(p) for p in shape.points])
-        return self.orientation_cache[tuple(normalized_points)]
+        self.shape_orientations = [orientations_by_shape[id(shape)] for shape in self.shapes_to_pack]
+
+    def _placements(self, orientation_data: Dict, board_mask: int) -> List[Tuple[int, int, int]]:
+        """
+        返回该朝向所有落在允许区域内的放置 (x, y, 占用位掩码)，按原点行优先排列。
+        用位运算一次判断整块形状是否落在允许区域内。
+        """
+        shape_mask = points_to_mask(orientation_data["points"], self.board_width)
+        placements = []
+        for y in range(self.board_height - orientation_data["height"] + 1):
+            for x in range(self.board_width - orientation_data["width"] + 1):
+                placed_mask = shape_mask << (y * self.board_width + x)
+                if placed_mask & board_mask == placed_mask:
+                    placements.append((x, y, placed_mask))
+        return placements
 
     def _create_variables(self):
-        """为模型创建变量。"""
+        """为模型创建变量。无法放入允许区域的形状被剪除，不创建任何变量。"""
+        board_area = self._board_mask.bit_count()
+        # 同种形状的实例共享朝向列表，合法放置只需计算一次
+        placements_cache: Dict[int, List[Tuple[int, int, int]]] = {}
+
         for i, shape in enumerate(self.shapes_to_pack):
+            candidates = []
+            if shape.area <= board_area:
+                for orientation_data in self.shape_orientations[i]:
+                    # 该朝向在棋盘尺寸内完全不可能放下时，不创建候选变量。
+                    if orientation_data["width"] > self.board_width or orientation_data["height"] > self.board_height:
+                        continue
+
+                    # 允许区域内没有任何合法放置位置时，同样不创建候选变量。
+                    key = id(orientation_data)
+                    if key not in placements_cache:
+                        placements_cache[key] = self._placements(orientation_data, self._board_mask)
+                    if placements_cache[key]:
+                        candidates.append((orientation_data, placements_cache[key]))
+
+            if not candidates:
+                self.pruned_shape_names.append(shape.name)
+                continue
+
             is_used = self.model.NewBoolVar(f"is_used_{i}")
             orientation_vars = []
-
-            for j, orientation_data in enumerate(self._get_shape_orientations(shape)):
-                shape_width = orientation_data["width"]
-                shape_height = orientation_data["height"]
-
-                # 该朝向在棋盘尺寸内完全不可能放下时，不创建候选变量。
-                if shape_width > self.board_width or shape_height > self.board_height:
-                    continue
-
+            for orientation_data, placements in candidates:
+                xs = [x for x, _, _ in placements]
+                ys = [y for _, y, _ in placements]
+                x_bounds = (min(xs), max(xs))
+                y_bounds = (min(ys), max(ys))
                 orientation_is_used = self.model.NewBoolVar(f"is_used_{i}_rot_{orientation_data['rotation']}")
-                x = self.model.NewIntVar(0, self.board_width - shape_width, f"x_{i}_rot_{orientation_data['rotation']}")
-                y = self.model.NewIntVar(0, self.board_height - shape_height, f"y_{i}_rot_{orientation_data['rotation']}")
+                x = self.model.NewIntVar(*x_bounds, f"x_{i}_rot_{orientation_data['rotation']}")
+                y = self.model.NewIntVar(*y_bounds, f"y_{i}_rot_{orientation_data['rotation']}")
 
                 orientation_vars.append(
                     {
                         "rotation": orientation_data["rotation"],
                         "points": orientation_data["points"],
                         "rectangles": orientation_data["rectangles"],
-                        "width": shape_width,
-                        "height": shape_height,
+                        "width": orientation_data["width"],
+                        "height": orientation_data["height"],
+                        "placements": placements,
+                        "x_bounds": x_bounds,
+                        "y_bounds": y_bounds,
                         "is_used": orientation_is_used,
                         "x": x,
                         "y": y,
                     }
                 )
 
-            if orientation_vars:
-                self.model.Add(sum(o["is_used"] for o in orientation_vars) == is_used)
-            else:
-                self.model.Add(is_used == 0)
+            self.model.Add(cp_model.LinearExpr.Sum([o["is_used"] for o in orientation_vars]) == is_used)
 
             self.shape_vars.append(
                 {
@@ -256,80 +399,198 @@ class PackingSolver:
 
     def _add_constraints(self):
         """向模型添加约束。"""
-        # 必须放置的形状
-        if self.must_place_names:
-            for s in self.shape_vars:
-                if s["name"] in self.must_place_names:
-                    self.model.Add(s["is_used"] == 1)
-
-        # 单元格必须在允许的范围内
-        allowed_cells_set = {tuple(cell) for cell in self.allowed_cells}
-        allowed_indices = [(r * self.board_width + c,) for r, c in allowed_cells_set]
-
+        # 单元格必须在允许的范围内：每个朝向只允许取预先用位掩码筛选出的放置原点。
+        # 在 x/y 的取值范围内，用允许表和禁止表中较小的一个表达；禁止表为空时无需约束。
         for s in self.shape_vars:
             for orientation in s["orientations"]:
-                occupied_cells = []
-                for p_dx, p_dy in orientation["points"]:
-                    cell_var = self.model.NewIntVar(
-                        0,
-                        self.board_height * self.board_width - 1,
-                        f"cell_{s['id']}_{orientation['rotation']}_{p_dx}_{p_dy}",
-                    )
-                    self.model.Add(
-                        cell_var == (orientation["y"] + p_dy) * self.board_width + (orientation["x"] + p_dx)
-                    )
-                    occupied_cells.append(cell_var)
+                origins = {(x, y) for x, y, _ in orientation["placements"]}
+                x_lb, x_ub = orientation["x_bounds"]
+                y_lb, y_ub = orientation["y_bounds"]
+                forbidden_origins = [
+                    (x, y)
+                    for y in range(y_lb, y_ub + 1)
+                    for x in range(x_lb, x_ub + 1)
+                    if (x, y) not in origins
+                ]
+                if not forbidden_origins:
+                    continue
 
-                for cell in occupied_cells:
-                    self.model.AddAllowedAssignments([cell], allowed_indices).OnlyEnforceIf(orientation["is_used"])
+                xy = [orientation["x"], orientation["y"]]
+                if len(forbidden_origins) < len(origins):
+                    constraint = self.model.AddForbiddenAssignments(xy, forbidden_origins)
+                else:
+                    constraint = self.model.AddAllowedAssignments(xy, sorted(origins))
+                constraint.OnlyEnforceIf(orientation["is_used"])
 
         # 不重叠约束
         all_x_intervals = []
         all_y_intervals = []
+        rect_widths = []
+        rect_heights = []
         for s in self.shape_vars:
             for orientation in s["orientations"]:
                 for k, rect in enumerate(orientation["rectangles"]):
                     rect_dx, rect_dy, rect_w, rect_h = rect
                     suffix = f"{s['id']}_{orientation['rotation']}_{k}"
 
-                    x_start = self.model.NewIntVar(0, self.board_width, f"x_start_{suffix}")
-                    x_end = self.model.NewIntVar(0, self.board_width, f"x_end_{suffix}")
-                    self.model.Add(x_start == orientation["x"] + rect_dx)
-                    self.model.Add(x_end == x_start + rect_w)
+                    # 起止位置直接使用仿射表达式，无需额外的辅助变量
                     x_interval = self.model.NewOptionalIntervalVar(
-                        x_start, rect_w, x_end, orientation["is_used"], f"x_interval_{suffix}"
+                        orientation["x"] + rect_dx,
+                        rect_w,
+                        orientation["x"] + rect_dx + rect_w,
+                        orientation["is_used"],
+                        f"x_interval_{suffix}",
                     )
-
-                    y_start = self.model.NewIntVar(0, self.board_height, f"y_start_{suffix}")
-                    y_end = self.model.NewIntVar(0, self.board_height, f"y_end_{suffix}")
-                    self.model.Add(y_start == orientation["y"] + rect_dy)
-                    self.model.Add(y_end == y_start + rect_h)
                     y_interval = self.model.NewOptionalIntervalVar(
-                        y_start, rect_h, y_end, orientation["is_used"], f"y_interval_{suffix}"
+                        orientation["y"] + rect_dy,
+                        rect_h,
+                        orientation["y"] + rect_dy + rect_h,
+                        orientation["is_used"],
+                        f"y_interval_{suffix}",
                     )
 
                     all_x_intervals.append(x_interval)
                     all_y_intervals.append(y_interval)
+                    rect_widths.append(rect_w)
+                    rect_heights.append(rect_h)
 
         if all_x_intervals:
             self.model.AddNoOverlap2D(all_x_intervals, all_y_intervals)
 
-        # 对称性破坏：同名重复形状优先使用前面的实例，减少等价搜索分支。
+            # 冗余的一维累积约束：任一列（行）上被覆盖的格子数不超过该列（行）允许格子数的最大值。
+            # 对可行性没有影响，但传播比二维推理更快，能更早剪枝。
+            column_capacity = max(Counter(c for _, c in self.allowed_cells).values())
+            row_capacity = max(Counter(r for r, _ in self.allowed_cells).values())
+            self.model.AddCumulative(all_x_intervals, rect_heights, column_capacity)
+            self.model.AddCumulative(all_y_intervals, rect_widths, row_capacity)
+
+        # 对称性破坏：同名重复形状可以任意互换，
+        # (a) 优先使用前面的实例；(b) 同时使用时，按位置键的字典序排列。
         grouped_shapes = defaultdict(list)
         for s in self.shape_vars:
             grouped_shapes[s["name"]].append(s)
 
         for instances in grouped_shapes.values():
-            if len(instances) > 1:
-                for i in range(len(instances) - 1):
-                    s1 = instances[i]
-                    s2 = instances[i + 1]
-                    self.model.Add(s1["is_used"] >= s2["is_used"])
+            if len(instances) < 2:
+                continue
+
+            for s in instances:
+                self._pin_unused_orientations(s)
+            position_keys = [self._position_key(s) for s in instances]
+            for i in range(len(instances) - 1):
+                s1 = instances[i]
+                s2 = instances[i + 1]
+                self.model.Add(s2["is_used"] <= s1["is_used"])
+                # 使用 s2 必然已使用 s1，只需一个条件文字
+                self.model.Add(position_keys[i] <= position_keys[i + 1]).OnlyEnforceIf(s2["is_used"])
+
+    def _pin_unused_orientations(self, s: Dict):
+        """把实例中未选用朝向的 x/y 固定在各自下界。"""
+        for orientation in s["orientations"]:
+            not_used = orientation["is_used"].Not()
+            self.model.Add(orientation["x"] == orientation["x_bounds"][0]).OnlyEnforceIf(not_used)
+            self.model.Add(orientation["y"] == orientation["y_bounds"][0]).OnlyEnforceIf(not_used)
+
+    def _position_key(self, s: Dict):
+        """
+        返回实例的位置键（仿射表达式），不向模型添加任何约束。
+
+        配合 `_pin_unused_orientations`，未选用的朝向 x/y 取各自下界，因此位置键只随
+        选中朝向的原点变化，等于 `_option_rank` 加上一个对同名实例相同的常数。
+        """
+        orientations = s["orientations"]
+        return cp_model.LinearExpr.WeightedSum(
+            [o["y"] for o in orientations] + [o["x"] for o in orientations],
+            [self.board_width] * len(orientations) + [1] * len(orientations),
+        )
+
+    def _option_rank(self, orientation: Dict, x: int, y: int) -> int:
+        """放置 (orientation, x, y) 时位置键相对于常数部分的取值。"""
+        x_lb, y_lb = orientation["x_bounds"][0], orientation["y_bounds"][0]
+        return self.board_width * (y - y_lb) + (x - x_lb)
+
+    def _greedy_placements(self) -> List[Optional[Tuple[Dict, int, int]]]:
+        """用位掩码贪心算法为每个形状求一个放置 (朝向, x, y)，放不下的为 None。"""
+        options_per_shape = []
+        for s in self.shape_vars:
+            options = [
+                (self._option_rank(orientation, x, y), k, orientation, x, y, placed_mask)
+                for k, orientation in enumerate(s["orientations"])
+                for x, y, placed_mask in orientation["placements"]
+            ]
+            options.sort(key=lambda o: (o[0], o[1]))
+            options_per_shape.append(options)
+
+        # 必须放置的形状优先，其余按面积从大到小
+        must_place_bonus = self.board_width * self.board_height
+        priorities = [
+            s["area"] + (must_place_bonus if s["name"] in self.must_place_names else 0)
+            for s in self.shape_vars
+        ]
+        chosen = greedy_bottom_left(
+            [[o[5] for o in options] for options in options_per_shape], priorities
+        )
+
+        placements: List[Optional[Tuple[Dict, int, int]]] = []
+        for options, k in zip(options_per_shape, chosen):
+            if k is None:
+                placements.append(None)
+            else:
+                _, _, orientation, x, y, _ = options[k]
+                placements.append((orientation, x, y))
+
+        greedy_area = sum(s["area"] for s, p in zip(self.shape_vars, placements) if p is not None)
+        print(f"贪心预放置: 面积 = {greedy_area}。")
+        return placements
+
+    def _greedy_result(self, placements: List[Optional[Tuple[Dict, int, int]]]) -> PackingResult:
+        """将装下全部形状的贪心放置直接转换为 PackingResult。"""
+        placed_shapes = []
+        for s, placement in zip(self.shape_vars, placements):
+            if placement is None:
+                continue
+            orientation, x, y = placement
+            placed_shapes.append(
+                PlacedShape(
+                    name=s["name"],
+                    x=x,
+                    y=y,
+                    points=orientation["points"],
+                    color=s["color"],
+                    rotation=orientation["rotation"],
+                )
+            )
+
+        return PackingResult(
+            placed_shapes=placed_shapes,
+            unplaced_shapes=list(self.pruned_shape_names),
+            board_size=(self.board_width, self.board_height),
+            status=PackingStatus.OPTIMAL,
+        )
+
+    def _add_hints(self, placements: List[Optional[Tuple[Dict, int, int]]]):
+        """
+        将贪心放置作为完整的解提示交给 CP-SAT。
+        未选用的朝向提示为不使用，x/y 取各自下界，与对称性破坏中的固定约束一致。
+        """
+        for s, placement in zip(self.shape_vars, placements):
+            chosen, x, y = placement if placement is not None else (None, None, None)
+            self.model.AddHint(s["is_used"], chosen is not None)
+            for orientation in s["orientations"]:
+                if orientation is chosen:
+                    self.model.AddHint(orientation["is_used"], 1)
+                    self.model.AddHint(orientation["x"], x)
+                    self.model.AddHint(orientation["y"], y)
+                else:
+                    self.model.AddHint(orientation["is_used"], 0)
+                    self.model.AddHint(orientation["x"], orientation["x_bounds"][0])
+                    self.model.AddHint(orientation["y"], orientation["y_bounds"][0])
 
     def _set_objective(self):
         """设置优化目标。"""
-        total_area = sum(s["area"] * s["is_used"] for s in self.shape_vars)
-        self.model.Maximize(total_area)
+        used = [s["is_used"] for s in self.shape_vars]
+        areas = [s["area"] for s in self.shape_vars]
+        self.model.Maximize(cp_model.LinearExpr.WeightedSum(used, areas))
 
     def _process_solution(
         self, solver: cp_model.CpSolver, status: int, callback: SolutionCallback
@@ -362,7 +623,7 @@ class PackingSolver:
                 )
                 for ps in callback.solution["placed_shapes"]
             ]
-            unplaced_shape_names = callback.solution["unplaced_shapes"]
+            unplaced_shape_names = callback.solution["unplaced_shapes"] + self.pruned_shape_names
         # 如果没有找到解 (INFEASIBLE)
         elif status == cp_model.INFEASIBLE:
             print("未找到可行解。")
@@ -377,8 +638,35 @@ class PackingSolver:
         )
 
 
+# solve_packing 最近一次使用的求解器及其输入，GUI 反复求解相同输入时直接复用已构建的模型
+_cached_solver: Optional[Tuple[Tuple, "PackingSolver"]] = None
+
+
+def _solver_cache_key(
+    shape_counts: Dict[str, int],
+    shape_defs: Dict[str, Dict],
+    allowed_cells: Optional[List[Tuple[int, int]]],
+    board_size: Tuple[int, int],
+) -> Tuple:
+    """由决定模型结构的输入生成缓存键；必须放置的形状与时间限制不影响模型。"""
+    shapes = tuple(
+        (
+            name,
+            count,
+            tuple(map(tuple, shape_defs[name]["points"])),
+            shape_defs[name]["color"],
+            shape_defs[name].get("area"),
+        )
+        for name, count in shape_counts.items()
+        if count > 0 and name in shape_defs
+    )
+    cells = tuple(map(tuple, allowed_cells)) if allowed_cells is not None else None
+    return shapes, cells, tuple(board_size)
+
+
 def solve_packing(
-    shapes_to_pack: List[Dict],
+    shape_counts: Dict[str, int],
+    shape_defs: Dict[str, Dict],
     allowed_cells: Optional[List[Tuple[int, int]]] = None,
     board_size: Tuple[int, int] = (10, 10),
     must_place_names: Optional[List[str]] = None,
@@ -386,27 +674,46 @@ def solve_packing(
 ) -> Tuple[List[Dict], List[str], str]:
     """
     用于与 gui.py 兼容的包装函数。
+
+    shape_counts 为 {形状名称: 数量}，shape_defs 为 {形状名称: 形状定义字典}。
+    每种形状只创建一个 Shape 对象，同名的多个实例共享它。
+    与上一次调用的形状、允许区域和棋盘尺寸相同时，复用上一次构建的求解器。
     """
-    # 1. 将 List[Dict] 转换为 List[Shape]
-    shape_objects = [
-        Shape(
-            name=shape_dict["name"],
-            points=shape_dict["points"],
-            color=shape_dict["color"],
-            area=shape_dict.get("area", len(shape_dict["points"])),
+    global _cached_solver
+
+    cache_key = _solver_cache_key(shape_counts, shape_defs, allowed_cells, board_size)
+    if _cached_solver is not None and _cached_solver[0] == cache_key:
+        solver = _cached_solver[1]
+        solver.time_limit_sec = time_limit_sec
+    else:
+        # 1. 每种形状只转换一次 Dict -> Shape，再按数量展开为实例列表
+        shape_objects = {
+            name: Shape(
+                name=shape_dict["name"],
+                points=shape_dict["points"],
+                color=shape_dict["color"],
+                area=shape_dict.get("area", len(shape_dict["points"])),
+            )
+            for name, shape_dict in shape_defs.items()
+            if shape_counts.get(name, 0) > 0
+        }
+        shapes_to_pack = [
+            shape_objects[name]
+            for name, count in shape_counts.items()
+            if name in shape_objects
+            for _ in range(count)
+        ]
+
+        # 2. 实例化求解器
+        solver = PackingSolver(
+            shapes_to_pack=shapes_to_pack,
+            board_size=board_size,
+            allowed_cells=allowed_cells,
+            time_limit_sec=time_limit_sec,
         )
-        for shape_dict in shapes_to_pack
-    ]
-
-    # 2. 实例化并运行求解器
-    solver = PackingSolver(
-        shapes_to_pack=shape_objects,
-        board_size=board_size,
-        allowed_cells=allowed_cells,
-        must_place_names=must_place_names,
-        time_limit_sec=time_limit_sec,
-    )
-    result = solver.solve()
+        _cached_solver = (cache_key, solver)
+
+    result = solver.solve(must_place_names if must_place_names is not None else [])
 
     # 3. 将 PackingResult 转换回 gui.py 期望的格式
     placed_shapes_dicts = []
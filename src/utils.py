@@ -1,15 +1,25 @@
+import functools
+import json
 import sys
-import os
 from pathlib import Path
+from typing import Any, Dict, List
 
+try:
+    import orjson
+except ImportError:  # orjson 是可选依赖，未安装时退回标准库 json
+    orjson = None
 
-def resource_path(relative_path: str) -> str:
-    try:
-        base_path = Path(sys._MEIPASS)  # type: ignore
-    except AttributeError:
-        base_path = Path(__file__).resolve().parent.parent
 
-    final_path = base_path / relative_path
+# 资源根目录只需确定一次：打包后为 PyInstaller 的解压目录，否则为项目根目录。
+try:
+    _BASE_PATH = Path(sys._MEIPASS)  # type: ignore
+except AttributeError:
+    _BASE_PATH = Path(__file__).resolve().parent.parent
+
+
+@functools.lru_cache(maxsize=None)
+def resource_path(relative_path: str) -> str:
+    final_path = _BASE_PATH / relative_path
 
     # 可选：如果希望在返回前就确认文件存在，可以取消下面的注释。
     # 但这会改变原始函数的行为，需要评估对项目的影响。
@@ -17,3 +27,15 @@ def resource_path(relative_path: str) -> str:
     #     raise FileNotFoundError(f"Resource not found at: {final_path}")
 
     return str(final_path)
+
+
+def load_shapes_file(path: str) -> List[Dict[str, Any]]:
+    """读取形状定义文件，并补全每个形状的面积字段。"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    shapes: List[Dict[str, Any]] = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    # 预先补全面积字段，后续使用时无需再计算 len(points)
+    for shape in shapes:
+        shape.setdefault("area", len(shape["points"]))
+    return shapes
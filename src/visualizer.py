@@ -4,6 +4,9 @@ from tkinter import ttk
 GRID_WIDTH = 9
 GRID_HEIGHT = 9
 
+# 带有此 tag 的 item 由调用方长期持有，清空画布时保留
+PERSISTENT_TAG = "persistent"
+
 
 class ResultVisualizer:
     """Handles drawing the results of the shape packing on a canvas."""
@@ -12,77 +15,93 @@ class ResultVisualizer:
         self.canvas = canvas
         self.on_clear_unplaced = on_clear_unplaced
         self.clear_button = None
+        self._board_image = None
 
     def clear_canvas(self):
-        """Clears all items from the canvas."""
+        """Clears all items from the canvas except those tagged PERSISTENT_TAG."""
         if hasattr(self, "clear_button") and self.clear_button:
             try:
                 self.clear_button.destroy()
             except Exception:
                 pass
             self.clear_button = None
-        self.canvas.delete("all")
+        self.canvas.delete(f"!{PERSISTENT_TAG}")
 
-    def _draw_container_background(self, allowed_cells, scale, y_offset=0):
-        """Draws the background grid for the container."""
-        if not allowed_cells:
-            return
+    def _draw_board_image(self, allowed_cells, owners, placed_shapes, cell, y_offset=0):
+        """
+        Draws the container cells and the placed shapes as one image.
 
-        # First, draw all potential cells as unavailable
+        The board is rasterised at one pixel per cell (a 9x9 put), then zoomed up
+        to the cell size by Tk, so the cost does not depend on the canvas size.
+        """
+        allowed = set(allowed_cells)
+        rows = []
         for r in range(GRID_HEIGHT):
+            row = []
             for c in range(GRID_WIDTH):
-                x0, y0 = c * scale, r * scale + y_offset
-                x1, y1 = x0 + scale, y0 + scale
-                self.canvas.create_rectangle(
-                    x0, y0, x1, y1, fill="black", outline="whitesmoke"
+                owner = owners.get((c, r))
+                if owner is not None:
+                    row.append(placed_shapes[owner]["color"])
+                elif (r, c) in allowed:
+                    row.append("#ffffff")
+                else:
+                    row.append("#000000")
+            rows.append("{" + " ".join(row) + "}")
+
+        cells_image = tk.PhotoImage(master=self.canvas, width=GRID_WIDTH, height=GRID_HEIGHT)
+        cells_image.put(" ".join(rows))
+        # Keep a reference so the PhotoImage is not garbage collected
+        self._board_image = cells_image.zoom(cell)
+        self.canvas.create_image(0, y_offset, anchor="nw", image=self._board_image)
+
+    def _draw_cell_edges(self, owners, cell, draw_grid, y_offset=0):
+        """
+        Draws the grid lines and the bold shape outlines along the cell borders.
+
+        Each border between two cells (or a cell and the outside) is either
+        hidden (both sides belong to the same shape), a bold black outline (a
+        shape on at least one side) or a thin grid line. Consecutive borders
+        with the same style are merged into a single canvas line.
+        """
+        def style(a, b):
+            owner_a, owner_b = owners.get(a), owners.get(b)
+            if owner_a is not None or owner_b is not None:
+                return None if owner_a == owner_b else "outline"
+            return "grid" if draw_grid else None
+
+        segments = []
+        # Horizontal borders: above row y, spanning column x
+        for y in range(GRID_HEIGHT + 1):
+            styles = [style((x, y - 1), (x, y)) for x in range(GRID_WIDTH)]
+            segments.extend((kind, (x0, y), (x1, y)) for kind, x0, x1 in self._merge_runs(styles))
+        # Vertical borders: left of column x, spanning row y
+        for x in range(GRID_WIDTH + 1):
+            styles = [style((x - 1, y), (x, y)) for y in range(GRID_HEIGHT)]
+            segments.extend((kind, (x, y0), (x, y1)) for kind, y0, y1 in self._merge_runs(styles))
+
+        # Grid lines first so the outlines are drawn on top where they meet
+        for kind in ("grid", "outline"):
+            for segment_kind, (gx0, gy0), (gx1, gy1) in segments:
+                if segment_kind != kind:
+                    continue
+                self.canvas.create_line(
+                    gx0 * cell,
+                    gy0 * cell + y_offset,
+                    gx1 * cell,
+                    gy1 * cell + y_offset,
+                    fill="black" if kind == "outline" else "whitesmoke",
+                    width=2 if kind == "outline" else 1,
                 )
-        # Then, draw the allowed cells on top
-        for r, c in allowed_cells:
-            x0, y0 = c * scale, r * scale + y_offset
-            x1, y1 = x0 + scale, y0 + scale
-            self.canvas.create_rectangle(
-                x0, y0, x1, y1, fill="white", outline="whitesmoke"
-            )
 
-    def _draw_placed_shape_outlines(self, shape, scale, y_offset=0):
-        """Draws the bold black outline for a single placed shape."""
-        pos_x, pos_y = shape["position"]
-        shape_points_set = set((pos_x + p_dx, pos_y + p_dy) for p_dx, p_dy in shape["points"])
-
-        for p_dx, p_dy in shape["points"]:
-            gx, gy = pos_x + p_dx, pos_y + p_dy
-            x0, y0 = gx * scale, gy * scale + y_offset
-            x1, y1 = (gx + 1) * scale, (gy + 1) * scale + y_offset
-
-            # Top edge
-            if (gx, gy - 1) not in shape_points_set:
-                self.canvas.create_line(x0, y0, x1, y0, fill="black", width=2)
-            # Bottom edge
-            if (gx, gy + 1) not in shape_points_set:
-                self.canvas.create_line(x0, y1, x1, y1, fill="black", width=2)
-            # Left edge
-            if (gx - 1, gy) not in shape_points_set:
-                self.canvas.create_line(x0, y0, x0, y1, fill="black", width=2)
-            # Right edge
-            if (gx + 1, gy) not in shape_points_set:
-                self.canvas.create_line(x1, y0, x1, y1, fill="black", width=2)
-
-    def _draw_placed_shapes(self, placed_shapes, scale, y_offset=0):
-        """Draws the placed shapes on the canvas."""
-        for shape in placed_shapes:
-            color = shape["color"]
-            pos_x, pos_y = shape["position"]
-
-            # First, draw all the rectangles for the shape without an outline
-            for p_dx, p_dy in shape["points"]:
-                x0 = (pos_x + p_dx) * scale
-                y0 = (pos_y + p_dy) * scale + y_offset
-                x1 = x0 + scale
-                y1 = y0 + scale
-                self.canvas.create_rectangle(x0, y0, x1, y1, fill=color, outline="")
-
-            # Now, draw the bold black outline
-            self._draw_placed_shape_outlines(shape, scale, y_offset=y_offset)
+    @staticmethod
+    def _merge_runs(styles):
+        """Yields (style, start, end) for each run of equal, non-None styles."""
+        start = 0
+        for i in range(1, len(styles) + 1):
+            if i == len(styles) or styles[i] != styles[start]:
+                if styles[start] is not None:
+                    yield styles[start], start, i
+                start = i
 
     def _draw_unplaced_shapes(self, unplaced_shapes, canvas_width, unplaced_area_y_start):
         """Draws the unplaced shapes in a separate area."""
@@ -172,18 +191,28 @@ class ResultVisualizer:
         scale_y = placed_area_height / GRID_HEIGHT
         scale = min(scale_x, scale_y)
 
-        # Draw container background with offset
-        self._draw_container_background(allowed_cells, scale, y_offset=placed_area_y_offset)
+        # Tk can only zoom a PhotoImage by a whole factor, so cells are a whole number of pixels
+        cell = max(int(scale), 1)
+
+        placed_shapes = result.get("placed_shapes") if result else None
+        has_placed_shapes = bool(placed_shapes)
+        # Grid cell (x, y) -> index of the placed shape covering it
+        owners = {
+            (shape["position"][0] + p_dx, shape["position"][1] + p_dy): i
+            for i, shape in enumerate(placed_shapes or [])
+            for p_dx, p_dy in shape["points"]
+        }
+
+        if allowed_cells:
+            self._draw_board_image(allowed_cells, owners, placed_shapes, cell, y_offset=placed_area_y_offset)
+        self._draw_cell_edges(owners, cell, bool(allowed_cells), y_offset=placed_area_y_offset)
 
-        if not result or not result.get("placed_shapes"):
+        if not has_placed_shapes:
             self.canvas.create_text(
                 canvas_width / 2,
                 placed_area_height / 2 + placed_area_y_offset,
                 text="未找到解决方案",
                 font=("Arial", 16),
             )
-        else:
-            # Draw placed shapes with offset
-            self._draw_placed_shapes(result["placed_shapes"], scale, y_offset=placed_area_y_offset)
 
         self._draw_unplaced_shapes(unplaced_shapes, canvas_width, unplaced_area_y_start)
@@ -0,0 +1,73 @@
+import json
+import random
+import unittest
+
+from src.decomposition import (
+    _decompose_point_set,
+    _points_to_mask,
+    _scan_mask,
+    decompose_shape_to_rectangles,
+)
+from src.utils import resource_path
+
+
+def reference_decompose(points):
+    """原始的点集扫描算法，作为各实现的对照。"""
+    point_set = {tuple(p) for p in points}
+    rectangles = []
+    while point_set:
+        x, y = min(point_set, key=lambda p: (p[1], p[0]))
+        width = 1
+        while (x + width, y) in point_set:
+            width += 1
+        height = 1
+        while all((x + i, y + height) in point_set for i in range(width)):
+            height += 1
+        rectangles.append((x, y, width, height))
+        point_set -= {(x + i, y + j) for i in range(width) for j in range(height)}
+    return rectangles
+
+
+def scan_mask_decompose(points):
+    mask, min_x, min_y = _points_to_mask(points)
+    return [(x + min_x, y + min_y, w, h) for x, y, w, h in _scan_mask(mask).tolist()]
+
+
+class TestDecomposition(unittest.TestCase):
+    """测试形状分解为矩形的各实现与原始算法结果一致。"""
+
+    def assert_matches_reference(self, points):
+        expected = reference_decompose(points)
+        self.assertEqual(decompose_shape_to_rectangles(points), expected)
+        self.assertEqual(_decompose_point_set([tuple(p) for p in points]), expected)
+        self.assertEqual(scan_mask_decompose(points), expected)
+
+    def test_shapes_file(self):
+        """shapes.json 中的所有形状。"""
+        with open(resource_path("shapes.json"), encoding="utf-8") as f:
+            shapes = json.load(f)
+        for shape in shapes:
+            with self.subTest(shape=shape["name"]):
+                self.assert_matches_reference(shape["points"])
+
+    def test_random_point_sets(self):
+        """随机点集（含不连通、带偏移的情况）。"""
+        rng = random.Random(0)
+        for _ in range(500):
+            width, height = rng.randint(1, 6), rng.randint(1, 6)
+            offset_x, offset_y = rng.randint(0, 4), rng.randint(0, 4)
+            points = [
+                (x + offset_x, y + offset_y)
+                for y in range(height)
+                for x in range(width)
+                if rng.random() < 0.6
+            ]
+            if points:
+                self.assert_matches_reference(points)
+
+    def test_empty(self):
+        self.assertEqual(decompose_shape_to_rectangles([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
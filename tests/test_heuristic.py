@@ -0,0 +1,31 @@
+import unittest
+
+from src.heuristic import greedy_bottom_left
+
+
+class TestGreedyBottomLeft(unittest.TestCase):
+    """测试基于位掩码的贪心放置。"""
+
+    def test_higher_priority_placed_first(self):
+        """优先级高的形状先放置，抢占共同的候选位置。"""
+        candidates = [[0b1], [0b1]]
+        self.assertEqual(greedy_bottom_left(candidates, [1, 5]), [None, 0])
+
+    def test_equal_priority_keeps_order(self):
+        """优先级相同时保持原有顺序。"""
+        candidates = [[0b1], [0b1]]
+        self.assertEqual(greedy_bottom_left(candidates, [3, 3]), [0, None])
+
+    def test_first_non_conflicting_candidate(self):
+        """每个形状取第一个与已占用格子不冲突的候选位置。"""
+        candidates = [[0b0011], [0b0001, 0b0010, 0b0100, 0b1000]]
+        self.assertEqual(greedy_bottom_left(candidates, [2, 1]), [0, 2])
+
+    def test_unplaceable_returns_none(self):
+        """所有候选位置都冲突或没有候选位置时返回 None。"""
+        candidates = [[0b111], [0b001, 0b010, 0b100], []]
+        self.assertEqual(greedy_bottom_left(candidates, [3, 2, 1]), [0, None, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
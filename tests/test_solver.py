@@ -1,8 +1,38 @@
+import re
 import unittest
-from src.solver import PackingSolver, rotate_points, generate_unique_orientations
+from collections import Counter
+from unittest import mock
+
+import src.solver as solver_module
+from src.solver import PackingSolver, rotate_points, generate_unique_orientations, solve_packing
 from src.data_models import Shape, PackingStatus
 
 
+# 测试用的形状定义，格式与 shapes.json 相同
+SHAPE_DEFS = {
+    "T": {"name": "T", "points": [[0, 0], [1, 0], [2, 0], [1, 1], [1, 2]], "color": "#FF0000"},
+    "square": {"name": "square", "points": [[0, 0], [1, 0], [0, 1], [1, 1]], "color": "#00FF00"},
+    "i3": {"name": "i3", "points": [[0, 0], [0, 1], [0, 2]], "color": "#0000FF"},
+    "i2": {"name": "i2", "points": [[0, 0], [0, 1]], "color": "#FFFF00"},
+}
+
+
+def make_shape(name):
+    """由 SHAPE_DEFS 构造一个 Shape 实例。"""
+    shape_def = SHAPE_DEFS[name]
+    return Shape(
+        name=name,
+        points=shape_def["points"],
+        area=len(shape_def["points"]),
+        color=shape_def["color"],
+    )
+
+
+def square_cells(size):
+    """左上角 size x size 区域内的全部格子，(row, col) 格式。"""
+    return [(r, c) for r in range(size) for c in range(size)]
+
+
 class TestSolverRotation(unittest.TestCase):
     """测试求解器的旋转与求解逻辑。"""
 
@@ -54,5 +84,147 @@ class TestSolverRotation(unittest.TestCase):
         self.assertIn(result.placed_shapes[0].rotation, [90, 270])
 
 
+
+class TestGreedyShortcut(unittest.TestCase):
+    """测试贪心放置装下全部形状时跳过 CP-SAT 的捷径。"""
+
+    def test_all_placed_returns_optimal_without_cp_sat(self):
+        shapes = [make_shape(name) for name in ("square", "square", "i3", "i2")]
+        solver = PackingSolver(shapes_to_pack=shapes, board_size=(9, 9), allowed_cells=square_cells(9))
+
+        with mock.patch.object(PackingSolver, "_get_cp_solver") as get_cp_solver:
+            result = solver.solve()
+
+        get_cp_solver.assert_not_called()
+        self.assertEqual(result.status, PackingStatus.OPTIMAL)
+        self.assertEqual(len(result.placed_shapes), len(shapes))
+        self.assertEqual(result.unplaced_shapes, [])
+
+        # 各形状占用的格子互不重叠
+        occupied = [
+            (ps.x + dx, ps.y + dy) for ps in result.placed_shapes for dx, dy in ps.points
+        ]
+        self.assertEqual(len(occupied), len(set(occupied)))
+
+
+class TestPruning(unittest.TestCase):
+    """测试无法放入允许区域的形状在建模前被剪除。"""
+
+    def test_area_exceeding_board_is_unplaced(self):
+        """面积超过允许格子数的形状直接计入未放置。"""
+        solver = PackingSolver(
+            shapes_to_pack=[make_shape("T"), make_shape("square")],
+            board_size=(9, 9),
+            allowed_cells=square_cells(2),
+        )
+        result = solver.solve()
+
+        self.assertEqual(solver.pruned_shape_names, ["T"])
+        self.assertEqual(result.unplaced_shapes, ["T"])
+        self.assertEqual([ps.name for ps in result.placed_shapes], ["square"])
+
+    def test_no_legal_origin_is_unplaced(self):
+        """面积足够但在允许区域内没有任何合法放置的形状直接计入未放置。"""
+        solver = PackingSolver(
+            shapes_to_pack=[make_shape("i3"), make_shape("square")],
+            board_size=(9, 9),
+            allowed_cells=square_cells(2),
+        )
+        result = solver.solve()
+
+        self.assertEqual(solver.pruned_shape_names, ["i3"])
+        self.assertEqual(result.unplaced_shapes, ["i3"])
+        self.assertEqual([ps.name for ps in result.placed_shapes], ["square"])
+
+    def test_pruned_must_place_is_infeasible_without_cp_sat(self):
+        """必须放置的形状被剪除时直接返回 INFEASIBLE，不调用 CP-SAT。"""
+        solver = PackingSolver(
+            shapes_to_pack=[make_shape("i3"), make_shape("square")],
+            board_size=(9, 9),
+            allowed_cells=square_cells(2),
+            must_place_names=["i3"],
+        )
+
+        with mock.patch.object(PackingSolver, "_get_cp_solver") as get_cp_solver:
+            result = solver.solve()
+
+        get_cp_solver.assert_not_called()
+        self.assertEqual(result.status, PackingStatus.INFEASIBLE)
+        self.assertEqual(result.placed_shapes, [])
+
+
+class TestSolvePacking(unittest.TestCase):
+    """测试 gui.py 使用的 solve_packing 包装函数。"""
+
+    def setUp(self):
+        solver_module._cached_solver = None
+
+    def test_counts_expand_to_instances(self):
+        """数量大于 1 时，已放置与未放置的实例总数等于各形状数量之和。"""
+        shape_counts = {"square": 3, "i2": 2, "T": 2}
+        placed, unplaced, status = solve_packing(
+            shape_counts, SHAPE_DEFS, square_cells(4), board_size=(9, 9), time_limit_sec=10
+        )
+
+        self.assertIn(status, ("OPTIMAL", "FEASIBLE"))
+        self.assertEqual(len(placed) + len(unplaced), sum(shape_counts.values()))
+        names = Counter(p["name"] for p in placed) + Counter(unplaced)
+        self.assertEqual(names, Counter(shape_counts))
+
+    def test_reuses_solver_across_must_place_changes(self):
+        """相同输入、不同必须放置形状的多次求解复用同一个求解器，且结果各自正确。"""
+        # 3x3 区域内：不锁定时最优为 square + i3（面积 7）；
+        # 锁定 T 后其余形状都放不下；同时锁定 T 和 square 则无解。
+        shape_counts = {"T": 1, "square": 1, "i3": 1}
+        cases = [
+            ([], "OPTIMAL", {"square", "i3"}),
+            (["T"], "OPTIMAL", {"T"}),
+            (["T", "square"], "INFEASIBLE", set()),
+            ([], "OPTIMAL", {"square", "i3"}),
+        ]
+
+        cached_solvers = []
+        for must_place_names, expected_status, expected_placed in cases:
+            with self.subTest(must_place_names=must_place_names):
+                placed, unplaced, status = solve_packing(
+                    shape_counts,
+                    SHAPE_DEFS,
+                    square_cells(3),
+                    board_size=(9, 9),
+                    must_place_names=must_place_names,
+                    time_limit_sec=10,
+                )
+                self.assertEqual(status, expected_status)
+                self.assertEqual({p["name"] for p in placed}, expected_placed)
+                self.assertEqual(len(placed) + len(unplaced), 3)
+                cached_solvers.append(solver_module._cached_solver[1])
+
+        self.assertTrue(all(s is cached_solvers[0] for s in cached_solvers))
+
+    def test_must_place_keeps_parallel_search(self):
+        """锁定形状时 CP-SAT 仍使用多个工作线程搜索（不能退化为单线程）。"""
+        solver = PackingSolver(
+            shapes_to_pack=[make_shape("T"), make_shape("square"), make_shape("i3")],
+            board_size=(9, 9),
+            allowed_cells=square_cells(3),
+            must_place_names=["T"],
+        )
+        with mock.patch("src.solver.os.cpu_count", return_value=8):
+            cp_solver = solver._get_cp_solver()
+
+        log_lines = []
+        cp_solver.parameters.log_search_progress = True
+        cp_solver.parameters.log_to_stdout = False
+        cp_solver.log_callback = log_lines.append
+        result = solver.solve()
+
+        self.assertEqual(result.status, PackingStatus.OPTIMAL)
+        self.assertEqual([ps.name for ps in result.placed_shapes], ["T"])
+        log = "\n".join(log_lines)
+        workers = re.search(r"Starting search at .* with (\d+) workers", log)
+        self.assertIsNotNone(workers)
+        self.assertGreater(int(workers.group(1)), 1)
+
+
 if __name__ == "__main__":
     unittest.main()